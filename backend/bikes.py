@@ -4,12 +4,49 @@ This module defines a small in-memory catalog of bikes available on the market
 and provides helper functions to query and score them based on user needs.
 """
 
+import heapq
+from bisect import bisect_right
 from dataclasses import dataclass, asdict
-from typing import List, Dict, Any, Optional
+from functools import lru_cache
+from operator import itemgetter
+from typing import (
+    List,
+    Dict,
+    Any,
+    FrozenSet,
+    Iterable,
+    Optional,
+    Sequence,
+    Set,
+    Tuple,
+)
 
 
 @dataclass
 class Bike:
+    # Hand-written slots (dataclass(slots=True) needs Python 3.10): no per-bike
+    # __dict__ and faster attribute reads in the filter/score loops. Catalog
+    # bikes are cached and shared; treat them as read-only.
+    __slots__ = (
+        "id",
+        "name",
+        "brand",
+        "category",
+        "frame",
+        "groupset",
+        "wheel_size",
+        "motor",
+        "battery_wh",
+        "weight_kg",
+        "price_usd",
+        "suspension",
+        "brakes",
+        "terrain",
+        "category_lc",
+        "brand_lc",
+        "terrain_lc",
+    )
+
     id: str
     name: str
     brand: str
@@ -25,10 +62,21 @@ class Bike:
     brakes: str  # e.g., "disc", "rim"
     terrain: List[str]  # e.g., ["paved", "gravel", "trail", "urban"]
 
+    def __post_init__(self) -> None:
+        # Lowercased copies for case-insensitive matching; not dataclass fields,
+        # so they stay out of asdict() output.
+        self.category_lc: str = self.category.lower()
+        self.brand_lc: str = self.brand.lower()
+        self.terrain_lc: FrozenSet[str] = frozenset(t.lower() for t in self.terrain)
+
+
+@lru_cache(maxsize=1)
+def _catalog() -> Tuple[Bike, ...]:
+    """Returns a static catalog. In real apps, you'd load from a DB/API.
 
-def _catalog() -> List[Bike]:
-    """Returns a static catalog. In real apps, you'd load from a DB/API."""
-    return [
+    Built once and shared; treat the returned bikes as read-only.
+    """
+    return (
         Bike(
             id="r1",
             name="Alpine Road 105",
@@ -141,11 +189,78 @@ def _catalog() -> List[Bike]:
             brakes="disc",
             terrain=["trail", "gravel"],
         ),
-    ]
+    )
+
+
+@lru_cache(maxsize=1)
+def _catalog_dicts() -> Tuple[Dict[str, Any], ...]:
+    return tuple(asdict(b) for b in _catalog())
 
 
 def list_bikes() -> List[Dict[str, Any]]:
-    return [asdict(b) for b in _catalog()]
+    """Returns the catalog as dicts; the dicts are shared, so do not mutate them."""
+    return list(_catalog_dicts())
+
+
+@dataclass(frozen=True)
+class _CatalogIndex:
+    """Column-wise lookups over the catalog, keyed by position in ``_catalog()``."""
+
+    prices: Tuple[int, ...]  # ascending
+    by_price: Tuple[int, ...]  # positions, in the same order as ``prices``
+    by_category: Dict[str, FrozenSet[int]]
+    by_brand: Dict[str, FrozenSet[int]]
+    by_terrain: Dict[str, FrozenSet[int]]
+    motorized: FrozenSet[int]
+
+
+def _group(pairs: Iterable[Tuple[str, int]]) -> Dict[str, FrozenSet[int]]:
+    groups: Dict[str, Set[int]] = {}
+    for key, pos in pairs:
+        groups.setdefault(key, set()).add(pos)
+    return {key: frozenset(positions) for key, positions in groups.items()}
+
+
+@lru_cache(maxsize=1)
+def _catalog_index() -> _CatalogIndex:
+    bikes = _catalog()
+    by_price = tuple(sorted(range(len(bikes)), key=lambda i: bikes[i].price_usd))
+    return _CatalogIndex(
+        prices=tuple(bikes[i].price_usd for i in by_price),
+        by_price=by_price,
+        by_category=_group((b.category_lc, i) for i, b in enumerate(bikes)),
+        by_brand=_group((b.brand_lc, i) for i, b in enumerate(bikes)),
+        by_terrain=_group((t, i) for i, b in enumerate(bikes) for t in b.terrain_lc),
+        motorized=frozenset(i for i, b in enumerate(bikes) if b.motor is not None),
+    )
+
+
+def _filter_positions(
+    max_price: Optional[int] = None,
+    category: Optional[str] = None,
+    brand: Optional[str] = None,
+    terrain: Optional[str] = None,
+    motorized: Optional[bool] = None,
+) -> List[int]:
+    """Catalog positions matching every given filter, in catalog order."""
+    index = _catalog_index()
+    matches: Set[int] = set(range(len(index.by_price)))
+    if max_price is not None:
+        matches.intersection_update(
+            index.by_price[: bisect_right(index.prices, max_price)]
+        )
+    if category is not None:
+        matches.intersection_update(index.by_category.get(category.lower(), ()))
+    if brand is not None:
+        matches.intersection_update(index.by_brand.get(brand.lower(), ()))
+    if terrain is not None:
+        matches.intersection_update(index.by_terrain.get(terrain.lower(), ()))
+    if motorized is not None:
+        if motorized:
+            matches.intersection_update(index.motorized)
+        else:
+            matches.difference_update(index.motorized)
+    return sorted(matches)
 
 
 def filter_bikes(
@@ -156,23 +271,8 @@ def filter_bikes(
     motorized: Optional[bool] = None,
 ) -> List[Bike]:
     bikes = _catalog()
-    results: List[Bike] = []
-    for bike in bikes:
-        if max_price is not None and bike.price_usd > max_price:
-            continue
-        if category is not None and bike.category.lower() != category.lower():
-            continue
-        if brand is not None and bike.brand.lower() != brand.lower():
-            continue
-        if terrain is not None and terrain.lower() not in [t.lower() for t in bike.terrain]:
-            continue
-        if motorized is not None:
-            if motorized and bike.motor is None:
-                continue
-            if not motorized and bike.motor is not None:
-                continue
-        results.append(bike)
-    return results
+    positions = _filter_positions(max_price, category, brand, terrain, motorized)
+    return [bikes[i] for i in positions]
 
 
 def score_bike(bike: Bike, prefs: Dict[str, Any]) -> float:
@@ -188,11 +288,11 @@ def score_bike(bike: Bike, prefs: Dict[str, Any]) -> float:
             score -= 2.0
 
     desired_category = prefs.get("category")
-    if desired_category and bike.category.lower() == str(desired_category).lower():
+    if desired_category and bike.category_lc == str(desired_category).lower():
         score += 3.0
 
     desired_terrain = prefs.get("terrain")
-    if desired_terrain and str(desired_terrain).lower() in [t.lower() for t in bike.terrain]:
+    if desired_terrain and str(desired_terrain).lower() in bike.terrain_lc:
         score += 2.0
 
     motorized = prefs.get("motorized")
@@ -206,14 +306,24 @@ def score_bike(bike: Bike, prefs: Dict[str, Any]) -> float:
         score += max(0.0, 12.0 - bike.weight_kg) * 0.2
 
     brand_pref = prefs.get("brand")
-    if brand_pref and bike.brand.lower() == str(brand_pref).lower():
+    if brand_pref and bike.brand_lc == str(brand_pref).lower():
         score += 1.5
 
     return score
 
 
 def recommend_bikes(prefs: Dict[str, Any], limit: int = 3) -> List[Dict[str, Any]]:
-    candidates = filter_bikes(
+    """Ranks bikes for ``prefs``. Results are cached; do not mutate the dicts."""
+    return list(_recommend_bikes_cached(tuple(sorted(prefs.items())), limit))
+
+
+@lru_cache(maxsize=128)
+def _recommend_bikes_cached(
+    prefs_items: Tuple[Tuple[str, Any], ...], limit: int
+) -> Tuple[Dict[str, Any], ...]:
+    prefs = dict(prefs_items)
+    bikes = _catalog()
+    candidates: Sequence[int] = _filter_positions(
         max_price=prefs.get("budget"),
         category=prefs.get("category"),
         brand=prefs.get("brand"),
@@ -221,9 +331,13 @@ def recommend_bikes(prefs: Dict[str, Any], limit: int = 3) -> List[Dict[str, Any
         motorized=prefs.get("motorized"),
     )
     if not candidates:
-        candidates = _catalog()
-    ranked = sorted(candidates, key=lambda b: score_bike(b, prefs), reverse=True)
-    return [asdict(b) for b in ranked[:limit]]
+        candidates = range(len(bikes))
+    # Score once up front, then pick the top k on the precomputed score; ties
+    # keep catalog order, same as a stable descending sort.
+    scored = [(score_bike(bikes[i], prefs), i) for i in candidates]
+    ranked = heapq.nlargest(limit, scored, key=itemgetter(0))
+    dicts = _catalog_dicts()
+    return tuple(dicts[i] for _, i in ranked)
 
 
 def summarize_bike(b: Dict[str, Any]) -> str:
@@ -1,7 +1,9 @@
 """Minimal intent parsing to extract buyer preferences from free text."""
 
 import re
-from typing import Dict, Any
+from decimal import Decimal
+from functools import lru_cache
+from typing import Dict, Any, List, Optional, Tuple
 
 
 CATEGORY_KEYWORDS = {
@@ -20,6 +22,114 @@ TERRAIN_KEYWORDS = {
     "urban": ["city", "commute", "urban"],
 }
 
+# Budget like: under 1500, max 2k, $1000, 1,500, 2.5k, 2,500 dollars. Either a
+# number with thousands separators or a plain one (optionally with decimals),
+# then an optional "k" multiplier.
+_BUDGET_RE = re.compile(
+    r"(?:(?P<grouped>\d{1,3}(?:[.,]\d{3})+)(?!\d)|(?P<plain>\d+(?:[.,]\d+)?))"
+    r"\s*(?P<k>k\b)?"
+)
+# Every budget needs a digit; ASCII text without one (most chat turns) skips
+# _BUDGET_RE. Non-ASCII text always runs it, since \d also matches e.g. "１".
+_DIGITS = frozenset("0123456789")
+
+
+def _budget_amount(money: "re.Match[str]") -> Optional[int]:
+    """Whole-dollar budget for a ``_BUDGET_RE`` match, or None if unusable.
+
+    The whole part goes through int() so long amounts stay exact; a fraction
+    only counts under a "k" ("2.5k"), and is scaled with Decimal.
+    """
+    if money["grouped"]:
+        whole, frac = money["grouped"].replace(",", "").replace(".", ""), ""
+    else:
+        whole, _, frac = money["plain"].replace(",", ".").partition(".")
+    try:
+        amount = int(whole)
+    except ValueError:  # more digits than int() will convert
+        return None
+    if money["k"]:
+        amount *= 1000
+        if frac:
+            amount += int(Decimal("0." + frac) * 1000)
+    return amount
+
+
+_BRAND_RE = re.compile(
+    r"\b(giant|trek|specialized|canyon|cannondale|metro|alpine|peak|volt|terra)\b"
+)
+
+
+# Keyword tables scanned together, by the prefs slot they fill.
+_KEYWORD_SLOTS = {"category": CATEGORY_KEYWORDS, "terrain": TERRAIN_KEYWORDS}
+
+_SlotHit = Tuple[str, int, str]  # (slot, rank within the slot's table, label)
+
+
+def _trie_pattern(words: List[str]) -> str:
+    """Builds a regex alternation of ``words`` factored on common prefixes.
+
+    The engine then follows one branch per character instead of retrying every
+    keyword at each position; greedy optional tails keep longest-match order.
+    """
+    trie: Dict[str, Any] = {}
+    for word in words:
+        node = trie
+        for ch in word:
+            node = node.setdefault(ch, {})
+        node[""] = {}  # end of a word
+
+    def build(node: Dict[str, Any]) -> str:
+        branches = [re.escape(ch) + build(child) for ch, child in node.items() if ch]
+        if not branches:
+            return ""
+        body = branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+        return "(?:" + body + ")?" if "" in node else body
+
+    return build(trie)
+
+
+def _keyword_matcher(
+    slots: Dict[str, Dict[str, List[str]]],
+) -> Tuple["re.Pattern[str]", Dict[str, List[_SlotHit]]]:
+    """Compiles keyword tables into a single scan over the text.
+
+    The lookahead reports one hit per position, the longest keyword there.
+    Any other keyword matching at that position is a prefix of the reported
+    one, so each keyword's entry also carries the hits of its prefixes.
+    """
+    entries = [
+        (kw, (slot, rank, label))
+        for slot, table in slots.items()
+        for rank, (label, keywords) in enumerate(table.items())
+        for kw in keywords
+    ]
+    keywords = sorted({kw for kw, _ in entries})
+    lookup = {
+        keyword: [hit for kw, hit in entries if keyword.startswith(kw)]
+        for keyword in keywords
+    }
+    pattern = re.compile("(?=(" + _trie_pattern(keywords) + "))")
+    return pattern, lookup
+
+
+_KEYWORD_RE, _KEYWORD_LOOKUP = _keyword_matcher(_KEYWORD_SLOTS)
+
+
+def _match_slots(text: str) -> Dict[str, str]:
+    """Maps each slot to its earliest-declared label with a keyword in ``text``."""
+    best: Dict[str, Tuple[int, str]] = {}
+    for m in _KEYWORD_RE.finditer(text):
+        for slot, rank, label in _KEYWORD_LOOKUP[m.group(1)]:
+            if slot not in best or rank < best[slot][0]:
+                best[slot] = (rank, label)
+    return {slot: label for slot, (_, label) in best.items()}
+
+
+_MOTOR_YES = ("e-bike", "ebike", "electric", "motor", "battery", "assist")
+_MOTOR_NO = ("non-electric", "acoustic", "without motor", "no motor")
+_LIGHTWEIGHT = ("lightweight", "lighter", "light weight", "as light as")
+
 
 def parse_preferences(text: str) -> Dict[str, Any]:
     """Extracts a small set of preferences from a user utterance.
@@ -27,54 +137,47 @@ def parse_preferences(text: str) -> Dict[str, Any]:
     Returns keys among: budget (int), category (str), terrain (str), brand (str),
     motorized (bool), lightweight (bool)
     """
+    # Matching is case-insensitive and ignores surrounding whitespace, so
+    # normalize before the cache lookup to share entries between variants.
+    return dict(_parse_preferences_cached(text.strip().lower()))
+
+
+@lru_cache(maxsize=1024)
+def _parse_preferences_cached(t: str) -> Tuple[Tuple[str, Any], ...]:
+    # Memoized on the normalized text; callers get a fresh dict from
+    # parse_preferences.
     prefs: Dict[str, Any] = {}
-    t = text.lower()
-
-    # Budget like: under 1500, max 2k, $1000, 1,500, 2k, 2,500 dollars
-    money_pattern = re.search(r"(\$?\s*(\d{1,3}(?:[\.,]\d{3})*|\d+)(?:\s*(k|k\+))?)|((\d+(?:[\.,]\d+)?)\s*k)", t)
-    if money_pattern:
-        raw = money_pattern.group(0)
-        digits = re.findall(r"\d+(?:[\.,]\d+)?", raw)
-        if digits:
-            number = digits[0].replace(",", "").replace(".", "")
-            try:
-                value = int(number)
-                if "k" in raw:
-                    value *= 1000
-                prefs["budget"] = value
-            except ValueError:
-                pass
-    if any(x in t for x in ["under ", "below ", "max "]):
-        # heuristic: budget already covered; nothing extra
-        pass
-
-    # Category
-    for cat, kws in CATEGORY_KEYWORDS.items():
-        if any(k in t for k in kws):
-            prefs["category"] = cat
-            break
-
-    # Terrain
-    for terr, kws in TERRAIN_KEYWORDS.items():
-        if any(k in t for k in kws):
-            prefs["terrain"] = terr
-            break
+
+    # Budget
+    maybe_budget = not t.isascii() or not _DIGITS.isdisjoint(t)
+    money = _BUDGET_RE.search(t) if maybe_budget else None
+    if money:
+        budget = _budget_amount(money)
+        if budget is not None:
+            prefs["budget"] = budget
+
+    # Category and terrain, found in one pass over the text
+    labels = _match_slots(t)
+    if "category" in labels:
+        prefs["category"] = labels["category"]
+    if "terrain" in labels:
+        prefs["terrain"] = labels["terrain"]
 
     # Brand
-    brand_match = re.search(r"\b(giant|trek|specialized|canyon|cannondale|metro|alpine|peak|volt|terra)\b", t)
+    brand_match = _BRAND_RE.search(t)
     if brand_match:
         prefs["brand"] = brand_match.group(1).title()
 
     # Motorized intent
-    if any(x in t for x in ["e-bike", "ebike", "electric", "motor", "battery", "assist"]):
+    if any(x in t for x in _MOTOR_YES):
         prefs["motorized"] = True
-    if any(x in t for x in ["non-electric", "acoustic", "without motor", "no motor"]):
+    if any(x in t for x in _MOTOR_NO):
         prefs["motorized"] = False
 
     # Lightweight preference
-    if any(x in t for x in ["lightweight", "lighter", "light weight", "as light as"]):
+    if any(x in t for x in _LIGHTWEIGHT):
         prefs["lightweight"] = True
 
-    return prefs
+    return tuple(prefs.items())
 
 
@@ -1,21 +1,52 @@
 """Lightweight OpenAI client wrapper for chat completions."""
 
+import asyncio
+import hashlib
+import json
 import os
-from typing import List, Dict, Any, Optional
+import threading
+from collections import OrderedDict
+from typing import TYPE_CHECKING, List, Dict, Any, Iterator, Optional, cast
 
 from dotenv import load_dotenv
 
 try:
-    
-    from openai import OpenAI
+    import httpx
+    from openai import AsyncOpenAI, OpenAI
 except Exception:  # pragma: no cover - if openai not installed yet
-    OpenAI = None  # type: ignore
+    httpx = None  # type: ignore[assignment, unused-ignore]
+    AsyncOpenAI = None  # type: ignore[assignment, misc, unused-ignore]
+    OpenAI = None  # type: ignore[assignment, misc, unused-ignore]
 
+if TYPE_CHECKING:
+    from openai.types.chat import ChatCompletionMessageParam
 
 load_dotenv()
 
 
-def _get_client() -> "OpenAI":
+def _read_default_model() -> str:
+    return os.getenv("OPENAI_MODEL") or "gpt-4o-mini"
+
+
+# Read once instead of on every call; see reload_config().
+_default_model = _read_default_model()
+
+# Overall request timeout and connect timeout, in seconds.
+REQUEST_TIMEOUT_S = 60.0
+CONNECT_TIMEOUT_S = 10.0
+
+# Completed replies keyed by request, so identical prompts skip the round-trip.
+RESPONSE_CACHE_SIZE = 256
+_response_cache: "OrderedDict[str, str]" = OrderedDict()
+_response_cache_lock = threading.Lock()
+
+# Shared sync client and the key it was built with; see _get_client().
+_client: Optional["OpenAI"] = None
+_client_key: Optional[str] = None
+_client_lock = threading.Lock()
+
+
+def _api_key() -> str:
     api_key = os.getenv("OPENAI_API_KEY")
     if not api_key:
         raise RuntimeError(
@@ -25,7 +56,98 @@ def _get_client() -> "OpenAI":
         raise RuntimeError(
             "openai package not installed. Run: pip install -r requirements.txt"
         )
-    return OpenAI(api_key=api_key)
+    return api_key
+
+
+def _http_timeout() -> "httpx.Timeout":
+    return httpx.Timeout(REQUEST_TIMEOUT_S, connect=CONNECT_TIMEOUT_S)
+
+
+def _http_limits() -> "httpx.Limits":
+    return httpx.Limits(max_keepalive_connections=16, max_connections=32)
+
+
+def _get_client() -> "OpenAI":
+    """Returns a shared client so every chat turn reuses the same connection pool.
+
+    The key is re-read on each call (a cheap env lookup), so changing
+    OPENAI_API_KEY swaps the client instead of serving a stale one; the
+    replaced client is closed.
+    """
+    global _client, _client_key
+    api_key = _api_key()
+    stale = None
+    with _client_lock:
+        if _client is None or _client_key != api_key:
+            stale = _client
+            timeout = _http_timeout()
+            http_client = httpx.Client(timeout=timeout, limits=_http_limits())
+            _client = OpenAI(api_key=api_key, timeout=timeout, http_client=http_client)
+            _client_key = api_key
+        client = _client
+    if stale is not None:
+        stale.close()
+    return client
+
+
+def _close_client() -> None:
+    global _client, _client_key
+    with _client_lock:
+        stale, _client, _client_key = _client, None, None
+    if stale is not None:
+        stale.close()
+
+
+def _new_async_client() -> "AsyncOpenAI":
+    """Returns a fresh async client; close it (``async with``) before its loop ends.
+
+    Not cached: pooled async connections are bound to the event loop that
+    opened them, so callers scope one client to their own loop instead.
+    """
+    api_key = _api_key()
+    timeout = _http_timeout()
+    http_client = httpx.AsyncClient(timeout=timeout, limits=_http_limits())
+    return AsyncOpenAI(api_key=api_key, timeout=timeout, http_client=http_client)
+
+
+def default_model() -> str:
+    """The model used when a call does not name one (OPENAI_MODEL, as last read)."""
+    return _default_model
+
+
+def reload_config() -> None:
+    """Re-reads OPENAI_MODEL and closes the shared client after an env change."""
+    global _default_model
+    _default_model = _read_default_model()
+    _close_client()
+
+
+def _cache_key(
+    model: str,
+    temperature: float,
+    max_output_tokens: int,
+    messages: List[Dict[str, str]],
+) -> str:
+    payload = json.dumps(
+        [model, temperature, max_output_tokens, messages], sort_keys=True
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def _cache_get(key: str) -> Optional[str]:
+    with _response_cache_lock:
+        content = _response_cache.get(key)
+        if content is not None:
+            _response_cache.move_to_end(key)
+        return content
+
+
+def _cache_put(key: str, content: str) -> None:
+    with _response_cache_lock:
+        _response_cache[key] = content
+        _response_cache.move_to_end(key)
+        while len(_response_cache) > RESPONSE_CACHE_SIZE:
+            _response_cache.popitem(last=False)
 
 
 def chat(
@@ -38,18 +160,125 @@ def chat(
     Send a chat conversation to OpenAI and return assistant text.
 
     messages: list of {"role": "system|user|assistant", "content": "..."}
+
+    Replies are cached per (model, temperature, max tokens, messages), so
+    resending an identical conversation returns the stored text.
     """
+    # One request path for both APIs: collect the streamed reply.
+    return "".join(chat_stream(messages, model, temperature, max_output_tokens))
+
+
+def chat_stream(
+    messages: List[Dict[str, str]],
+    model: Optional[str] = None,
+    temperature: float = 0.2,
+    max_output_tokens: int = 500,
+) -> Iterator[str]:
+    """Like :func:`chat`, but yields the reply text as it is generated.
+
+    A cached reply is yielded in one piece; a completed stream is cached.
+    """
+    used_model = model or _default_model
+    key = _cache_key(used_model, temperature, max_output_tokens, messages)
+    cached = _cache_get(key)
+    if cached is not None:
+        yield cached
+        return
+
     client = _get_client()
-    used_model = model or os.getenv("OPENAI_MODEL", "gpt-4o-mini")
+    stream = client.chat.completions.create(
+        model=used_model,
+        temperature=temperature,
+        max_tokens=max_output_tokens,
+        messages=cast("List[ChatCompletionMessageParam]", messages),
+        stream=True,
+    )
 
-    response = client.chat.completions.create(
+    parts: List[str] = []
+    for chunk in stream:
+        delta = chunk.choices[0].delta.content if chunk.choices else None
+        if delta:
+            parts.append(delta)
+            yield delta
+    content = "".join(parts)
+    if content:
+        _cache_put(key, content)
+
+
+async def achat(
+    messages: List[Dict[str, str]],
+    model: Optional[str] = None,
+    temperature: float = 0.2,
+    max_output_tokens: int = 500,
+    client: Optional["AsyncOpenAI"] = None,
+) -> str:
+    """Async counterpart of :func:`chat`, sharing its reply cache.
+
+    Lets callers dispatch several conversations concurrently with
+    ``asyncio.gather`` instead of waiting on each round-trip in turn. Pass
+    ``client`` to share one connection pool across calls on the same loop;
+    without it, a short-lived client is opened and closed for this call.
+    """
+    used_model = model or _default_model
+    key = _cache_key(used_model, temperature, max_output_tokens, messages)
+    cached = _cache_get(key)
+    if cached is not None:
+        return cached
+
+    if client is None:
+        async with _new_async_client() as own_client:
+            return await achat(
+                messages, used_model, temperature, max_output_tokens, own_client
+            )
+
+    response = await client.chat.completions.create(
         model=used_model,
         temperature=temperature,
         max_tokens=max_output_tokens,
-        messages=messages,
+        messages=cast("List[ChatCompletionMessageParam]", messages),
     )
 
     content = response.choices[0].message.content if response.choices else None
+    if content:
+        _cache_put(key, content)
     return content or ""
 
 
+async def achat_many(
+    conversations: List[List[Dict[str, str]]],
+    model: Optional[str] = None,
+    temperature: float = 0.2,
+    max_output_tokens: int = 500,
+) -> List[str]:
+    """Runs :func:`achat` for each conversation concurrently, in input order.
+
+    Cached replies are served first; only the misses share one client,
+    closed once all of them have settled. The first failure, in input
+    order, is re-raised after that.
+    """
+    used_model = model or _default_model
+    replies: List[Optional[str]] = [
+        _cache_get(_cache_key(used_model, temperature, max_output_tokens, m))
+        for m in conversations
+    ]
+    misses = [i for i, reply in enumerate(replies) if reply is None]
+    if misses:
+        async with _new_async_client() as client:
+            results = await asyncio.gather(
+                *(
+                    achat(
+                        conversations[i],
+                        used_model,
+                        temperature,
+                        max_output_tokens,
+                        client,
+                    )
+                    for i in misses
+                ),
+                return_exceptions=True,
+            )
+        for i, result in zip(misses, results):
+            if isinstance(result, BaseException):
+                raise result
+            replies[i] = result
+    return [reply or "" for reply in replies]
@@ -1,11 +1,12 @@
 import os
-from typing import Dict, Any, List
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from typing import Dict, Any, List, Tuple
 
 import streamlit as st
 
 from bikes import recommend_bikes, summarize_bike
 from intents import parse_preferences
-from llm import chat
+from llm import chat, chat_stream, default_model
 
 
 st.set_page_config(page_title="Bike Purchase Assistant", page_icon="🚲")
@@ -23,6 +24,18 @@ st.markdown(
     unsafe_allow_html=True,
 )
 
+# (button label, utterance)
+QUICK_SUGGESTIONS = [
+    ("City under $800", "I commute in the city under $800"),
+    ("Gravel ~2500", "I want a gravel bike around 2500"),
+    ("Urban e-bike 3k", "an e-bike for urban rides under 3k"),
+]
+
+# Longest a quick-suggestion click waits on its prefetched reply, in seconds.
+PREFETCH_WAIT_S = 1.0
+
+ASK_FOR_PREFS = "Tell me your budget, terrain, and category to suggest bikes."
+
 
 def initialize_state() -> None:
     if "messages" not in st.session_state:
@@ -31,6 +44,8 @@ def initialize_state() -> None:
         st.session_state.prefs = {}
     if "shortlist" not in st.session_state:
         st.session_state.shortlist = []  # List[str] of bike ids
+    if "prefetch" not in st.session_state:
+        st.session_state.prefetch = prefetch_quick_replies()  # Dict[str, Future]
 
 
 def merge_prefs(state: Dict[str, Any], new: Dict[str, Any]) -> Dict[str, Any]:
@@ -41,9 +56,41 @@ def merge_prefs(state: Dict[str, Any], new: Dict[str, Any]) -> Dict[str, Any]:
     return merged
 
 
-def make_assistant_reply(user_text: str, prefs: Dict[str, Any]) -> str:
-    recs = recommend_bikes(prefs, limit=3) if prefs else []
-    rec_summaries = [f"- {summarize_bike(b)}" for b in recs]
+def prefs_key(prefs: Dict[str, Any]) -> Tuple[Tuple[str, Any], ...]:
+    """Hashable, order-independent form of a prefs dict for cache keys."""
+    return tuple(sorted(prefs.items()))
+
+
+# Streamlit reruns the whole script on every interaction; serve unchanged
+# inputs from its cache instead of recomputing.
+@st.cache_data(ttl=3600, max_entries=256)
+def cached_recommendations(prefs_items: Tuple[Tuple[str, Any], ...]) -> List[Dict[str, Any]]:
+    return recommend_bikes(dict(prefs_items), limit=3)
+
+
+@st.cache_data(ttl=3600, max_entries=256)
+def cached_summary(b: Dict[str, Any]) -> str:
+    return summarize_bike(b)
+
+
+@st.cache_data(max_entries=256)
+def render_chips(prefs_items: Tuple[Tuple[str, Any], ...]) -> str:
+    prefs = dict(prefs_items)
+    chips = []
+    for k in ["budget", "category", "terrain", "brand", "motorized", "lightweight"]:
+        if k in prefs:
+            chips.append(f"<span class='chip'>{k}: {prefs[k]}</span>")
+    return " ".join(chips)
+
+
+def render_specs(b: Dict[str, Any]) -> str:
+    return f"**Specs**: " + " ".join([f"<span class='spec'>{s}</span>" for s in [b['frame'], b['groupset'], f"{b['wheel_size']} wheels", f"{b['suspension']} suspension", f"{b['brakes']} brakes"]])
+
+
+def build_reply_messages(user_text: str, prefs: Dict[str, Any]) -> Tuple[List[Dict[str, str]], List[str]]:
+    """Returns the LLM conversation for this turn plus the recommendation bullets."""
+    recs = cached_recommendations(prefs_key(prefs)) if prefs else []
+    rec_summaries = [f"- {cached_summary(b)}" for b in recs]
 
     sys_prompt = (
         "You are a helpful bike-purchasing assistant.\n"
@@ -64,16 +111,73 @@ def make_assistant_reply(user_text: str, prefs: Dict[str, Any]) -> str:
         {"role": "user", "content": user_text},
         {"role": "system", "content": context},
     ]
+    return messages, rec_summaries
+
+
+def local_reply(rec_summaries: List[str], error: Exception) -> str:
+    base = "Here are some options based on what I understood:" if rec_summaries else ASK_FOR_PREFS
+    local = base + ("\n" + "\n".join(rec_summaries) if rec_summaries else "")
+    return local + f"\n\n(Note: LLM unavailable: {error})"
+
+
+def make_assistant_reply(user_text: str, prefs: Dict[str, Any]) -> str:
+    if not prefs:
+        # Nothing to recommend yet; no need for an LLM round-trip.
+        return ASK_FOR_PREFS
+    messages, rec_summaries = build_reply_messages(user_text, prefs)
     try:
         return chat(messages)
     except Exception as e:
-        base = "Here are some options based on what I understood:" if rec_summaries else "Tell me your budget, terrain, and category to suggest bikes."
-        local = base + ("\n" + "\n".join(rec_summaries) if rec_summaries else "")
-        return local + f"\n\n(Note: LLM unavailable: {e})"
+        return local_reply(rec_summaries, e)
+
+
+def stream_assistant_reply(user_text: str, prefs: Dict[str, Any]) -> str:
+    """Writes the reply into the current container as tokens arrive; returns the full text."""
+    if not prefs:
+        st.write(ASK_FOR_PREFS)
+        return ASK_FOR_PREFS
+    messages, rec_summaries = build_reply_messages(user_text, prefs)
+    try:
+        streamed = st.write_stream(chat_stream(messages))
+    except Exception as e:
+        reply = local_reply(rec_summaries, e)
+        st.write(reply)
+        return reply
+    return streamed if isinstance(streamed, str) else "".join(str(part) for part in streamed)
+
+
+@st.cache_resource
+def quick_prefs() -> Dict[str, Dict[str, Any]]:
+    """Prefs for each quick-suggestion utterance, parsed once per process.
+
+    Shared across sessions and reruns; treat the dicts as read-only.
+    """
+    return {q: parse_preferences(q) for _, q in QUICK_SUGGESTIONS}
+
+
+@st.cache_resource
+def prefetch_pool() -> ThreadPoolExecutor:
+    return ThreadPoolExecutor(max_workers=len(QUICK_SUGGESTIONS))
+
+
+def prefetch_quick_replies() -> Dict[str, "Future[str]"]:
+    """Speculatively requests the quick-suggestion replies for a fresh session.
+
+    The replies land in the LLM reply cache, so a click on a quick suggestion
+    (before any other preference is set) is answered without a round-trip.
+    """
+    if not os.getenv("OPENAI_API_KEY"):
+        return {}
+    futures: Dict[str, "Future[str]"] = {}
+    for _, q in QUICK_SUGGESTIONS:
+        # Prompts are assembled here; the worker threads only do network I/O.
+        messages, _ = build_reply_messages(q, merge_prefs({}, quick_prefs()[q]))
+        futures[q] = prefetch_pool().submit(chat, messages)
+    return futures
 
 
 def render_recommendations(prefs: Dict[str, Any]) -> None:
-    recs = recommend_bikes(prefs, limit=3) if prefs else []
+    recs = cached_recommendations(prefs_key(prefs)) if prefs else []
     if not recs:
         st.info("Provide details like budget, terrain, and category to get recommendations.")
         return
@@ -83,7 +187,7 @@ def render_recommendations(prefs: Dict[str, Any]) -> None:
             with c1:
                 st.subheader(f"{b['name']} · {b['brand']}")
                 st.caption(f"Category: {b['category']} · Terrain: {', '.join(b['terrain'])}")
-                st.markdown(f"**Specs**: " + " ".join([f"<span class='spec'>{s}</span>" for s in [b['frame'], b['groupset'], f"{b['wheel_size']} wheels", f"{b['suspension']} suspension", f"{b['brakes']} brakes"]]), unsafe_allow_html=True)
+                st.markdown(render_specs(b), unsafe_allow_html=True)
                 if b.get("motor"):
                     st.markdown(" ".join([f"<span class='spec'>motor: {b['motor']}</span>", f"<span class='spec'>{b.get('battery_wh','')}Wh</span>"]), unsafe_allow_html=True)
                 st.markdown(f"Price: <span class='price'>$ {b['price_usd']}</span>", unsafe_allow_html=True)
@@ -169,18 +273,15 @@ def main() -> None:
 
         st.divider()
         with st.expander("Environment"):
-            st.write("OPENAI_MODEL:", os.getenv("OPENAI_MODEL", "gpt-4o-mini"))
+            st.write("OPENAI_MODEL:", default_model())
             st.write("API Key set:", bool(os.getenv("OPENAI_API_KEY")))
 
     # Chat interface
     # Preference badges
     if st.session_state.prefs:
-        chips = []
-        for k in ["budget", "category", "terrain", "brand", "motorized", "lightweight"]:
-            if k in st.session_state.prefs:
-                chips.append(f"<span class='chip'>{k}: {st.session_state.prefs[k]}</span>")
-        if chips:
-            st.markdown(" ".join(chips), unsafe_allow_html=True)
+        chips_html = render_chips(prefs_key(st.session_state.prefs))
+        if chips_html:
+            st.markdown(chips_html, unsafe_allow_html=True)
 
     # Chat messages with avatars
     for msg in st.session_state.messages:
@@ -191,33 +292,28 @@ def main() -> None:
     user_input = st.chat_input("Ask about bikes, budget, terrain, or preferences...")
     if user_input:
         st.session_state.messages.append({"role": "user", "content": user_input})
+        with st.chat_message("user", avatar="🧑"):
+            st.write(user_input)
         extracted = parse_preferences(user_input)
         st.session_state.prefs = merge_prefs(st.session_state.prefs, extracted)
-        reply = make_assistant_reply(user_input, st.session_state.prefs)
+        with st.chat_message("assistant", avatar="🤖"):
+            reply = stream_assistant_reply(user_input, st.session_state.prefs)
         st.session_state.messages.append({"role": "assistant", "content": reply})
         st.rerun()
 
     # Quick suggestions
     st.caption("Try quick suggestions:")
-    col1, col2, col3 = st.columns(3)
-    if col1.button("City under $800"):
-        q = "I commute in the city under $800"
-        st.session_state.messages.append({"role": "user", "content": q})
-        st.session_state.prefs = merge_prefs(st.session_state.prefs, parse_preferences(q))
-        st.session_state.messages.append({"role": "assistant", "content": make_assistant_reply(q, st.session_state.prefs)})
-        st.rerun()
-    if col2.button("Gravel ~2500"):
-        q = "I want a gravel bike around 2500"
-        st.session_state.messages.append({"role": "user", "content": q})
-        st.session_state.prefs = merge_prefs(st.session_state.prefs, parse_preferences(q))
-        st.session_state.messages.append({"role": "assistant", "content": make_assistant_reply(q, st.session_state.prefs)})
-        st.rerun()
-    if col3.button("Urban e-bike 3k"):
-        q = "an e-bike for urban rides under 3k"
-        st.session_state.messages.append({"role": "user", "content": q})
-        st.session_state.prefs = merge_prefs(st.session_state.prefs, parse_preferences(q))
-        st.session_state.messages.append({"role": "assistant", "content": make_assistant_reply(q, st.session_state.prefs)})
-        st.rerun()
+    for col, (label, q) in zip(st.columns(len(QUICK_SUGGESTIONS)), QUICK_SUGGESTIONS):
+        if col.button(label):
+            prefetched = st.session_state.prefetch.get(q)
+            if prefetched is not None and not st.session_state.prefs:
+                # Same prompt as the prefetch: give an in-flight request a brief
+                # chance to land in the reply cache, otherwise ask afresh.
+                wait([prefetched], timeout=PREFETCH_WAIT_S)
+            st.session_state.messages.append({"role": "user", "content": q})
+            st.session_state.prefs = merge_prefs(st.session_state.prefs, quick_prefs()[q])
+            st.session_state.messages.append({"role": "assistant", "content": make_assistant_reply(q, st.session_state.prefs)})
+            st.rerun()
 
     st.divider()
     st.subheader("Top Recommendations")
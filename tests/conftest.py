@@ -0,0 +1,6 @@
+"""Puts backend/ on sys.path, matching the flat imports the app uses."""
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "backend"))
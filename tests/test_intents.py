@@ -0,0 +1,30 @@
+import pytest
+
+from intents import parse_preferences
+
+
+@pytest.mark.parametrize(
+    "text, budget",
+    [
+        ("under 1500", 1500),
+        ("max 2k", 2000),
+        ("$1000 or so", 1000),
+        ("around 1,500", 1500),
+        ("2,500 dollars", 2500),
+        ("2.5k", 2500),
+        ("budget 2.5 k", 2500),
+        ("under １５００", 1500),
+        ("12345678901234567890", 12345678901234567890),
+        ("5 kids", 5),
+        ("10kg", 10),
+        ("a road bike", None),
+    ],
+)
+def test_budget(text: str, budget: object) -> None:
+    assert parse_preferences(text).get("budget") == budget
+
+
+def test_long_budget_is_exact_and_does_not_raise() -> None:
+    assert parse_preferences("9" * 400)["budget"] == int("9" * 400)
+    # Past int()'s digit limit (Python 3.11+) the budget is dropped instead.
+    parse_preferences("9" * 5000)